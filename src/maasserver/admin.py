@@ -16,6 +16,6 @@ from django.apps import apps
 from django.contrib import admin
 
 # Register models in the admin site.  When the DEBUG setting is enabled, the
-# webapp will serve an administrator UI at /admin.
-for model in apps.get_app_config("maasserver").models.values():
-    admin.site.register(model)
+# webapp will serve an administrator UI at /admin.  All models are registered
+# with the default ModelAdmin in a single call.
+admin.site.register(list(apps.get_app_config("maasserver").models.values()))
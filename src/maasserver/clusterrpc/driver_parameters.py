@@ -29,20 +29,19 @@ __all__ = [
     "get_driver_parameters",
 ]
 
-from copy import deepcopy
 from operator import itemgetter
 
 from django import forms
-from jsonschema import validate
 
 from maasserver.config_forms import DictCharField
 from maasserver.fields import MACAddressFormField
 from maasserver.utils.forms import compose_invalid_choice_text
 from provisioningserver.drivers import (
+    make_schema_validator,
     MULTIPLE_CHOICE_SETTING_PARAMETER_FIELD_SCHEMA,
     SETTING_PARAMETER_FIELD_SCHEMA,
 )
-from provisioningserver.drivers.power import JSON_POWER_DRIVERS_SCHEMA
+from provisioningserver.drivers.power import JSON_POWER_DRIVERS_VALIDATOR
 from provisioningserver.drivers.power.registry import PowerDriverRegistry
 
 FIELD_TYPE_MAPPINGS = {
@@ -54,6 +53,31 @@ FIELD_TYPE_MAPPINGS = {
     "password": forms.CharField,
 }
 
+# Field types whose form fields take a set of choices.
+CHOICE_FIELD_TYPES = frozenset(("choice", "multiple_choice"))
+
+POWER_FIELD_SET_SCHEMA = {
+    "title": "Power type parameters field set schema",
+    "type": "array",
+    "items": {
+        "anyOf": [
+            SETTING_PARAMETER_FIELD_SCHEMA,
+            MULTIPLE_CHOICE_SETTING_PARAMETER_FIELD_SCHEMA,
+        ]
+    },
+}
+
+NOS_FIELD_SET_SCHEMA = {
+    "title": "NOS type parameters field set schema",
+    "type": "array",
+    "items": SETTING_PARAMETER_FIELD_SCHEMA,
+}
+
+# Validators are built once, since these schemas are checked every time the
+# driver parameters are computed.
+POWER_FIELD_SET_VALIDATOR = make_schema_validator(POWER_FIELD_SET_SCHEMA)
+NOS_FIELD_SET_VALIDATOR = make_schema_validator(NOS_FIELD_SET_SCHEMA)
+
 
 def make_form_field(json_field):
     """Build a Django form field based on the JSON spec.
@@ -64,10 +88,9 @@ def make_form_field(json_field):
     :return: The correct Django form field for the field type, as
         specified in FIELD_TYPE_MAPPINGS.
     """
-    field_class = FIELD_TYPE_MAPPINGS.get(
-        json_field["field_type"], forms.CharField
-    )
-    if json_field["field_type"] in ("choice", "multiple_choice"):
+    field_type = json_field["field_type"]
+    field_class = FIELD_TYPE_MAPPINGS.get(field_type, forms.CharField)
+    if field_type in CHOICE_FIELD_TYPES:
         invalid_choice_message = compose_invalid_choice_text(
             json_field["name"], json_field["choices"]
         )
@@ -129,17 +152,7 @@ def add_power_driver_parameters(
     for power_type in parameters_set:
         if name == power_type["name"]:
             return
-    field_set_schema = {
-        "title": "Power type parameters field set schema",
-        "type": "array",
-        "items": {
-            "anyOf": [
-                SETTING_PARAMETER_FIELD_SCHEMA,
-                MULTIPLE_CHOICE_SETTING_PARAMETER_FIELD_SCHEMA,
-            ]
-        },
-    }
-    validate(fields, field_set_schema)
+    POWER_FIELD_SET_VALIDATOR.validate(fields)
     params = {
         "driver_type": driver_type,
         "name": name,
@@ -178,7 +191,7 @@ def get_driver_parameters_from_json(
 
     :param json_power_type_parameters: Power type parameters expressed
         as a JSON string or as set of JSONSchema-verifiable objects.
-        Will be validated using jsonschema.validate().
+        Will be validated against JSON_POWER_DRIVERS_SCHEMA.
     :type json_power_type_parameters: JSON string or iterable.
     :param initial_power_params: Power paramaters that were already set, any
         field which matches will have its initial value set.
@@ -188,7 +201,7 @@ def get_driver_parameters_from_json(
     :return: A dict of power parameters for all power types, indexed by
         power type name.
     """
-    validate(json_power_type_parameters, JSON_POWER_DRIVERS_SCHEMA)
+    JSON_POWER_DRIVERS_VALIDATOR.validate(json_power_type_parameters)
     power_parameters = {
         # Empty type, for the case where nothing is entered in the form yet.
         "": DictCharField([], required=False, skip_check=True)
@@ -249,13 +262,15 @@ def get_all_power_types():
         provisioningserver.drivers.pod.JSON_POD_DRIVERS_SCHEMA
     """
     merged_types = []
-    for power_type_orig in PowerDriverRegistry.get_schema(
+    for power_type in PowerDriverRegistry.get_schema(
         detect_missing_packages=False
     ):
-        power_type = deepcopy(power_type_orig)
         driver_type = power_type.get("driver_type", "power")
         name = power_type["name"]
-        fields = power_type.get("fields", [])
+        # The schema is built afresh by the driver, but its fields are the
+        # driver's own settings. Copy them, since their defaults get updated
+        # by get_driver_parameters_from_json().
+        fields = [dict(field) for field in power_type.get("fields", [])]
         description = power_type["description"]
         chassis = power_type["chassis"]
         can_probe = power_type["can_probe"]
@@ -299,12 +314,7 @@ def add_nos_driver_parameters(
     for power_type in parameters_set:
         if name == power_type["name"]:
             return
-    field_set_schema = {
-        "title": "NOS type parameters field set schema",
-        "type": "array",
-        "items": SETTING_PARAMETER_FIELD_SCHEMA,
-    }
-    validate(fields, field_set_schema)
+    NOS_FIELD_SET_VALIDATOR.validate(fields)
     assert driver_type == "nos", "NOS driver type must be 'nos'."
     params = {
         "driver_type": driver_type,
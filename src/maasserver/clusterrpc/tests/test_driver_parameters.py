@@ -10,7 +10,6 @@ from maasserver.clusterrpc.driver_parameters import (
     add_power_driver_parameters,
     get_driver_parameters_from_json,
     get_driver_types,
-    JSON_POWER_DRIVERS_SCHEMA,
     make_form_field,
     SETTING_PARAMETER_FIELD_SCHEMA,
 )
@@ -21,6 +20,8 @@ from maasserver.testing.testcase import MAASServerTestCase
 from maasserver.utils.forms import compose_invalid_choice_text
 from maastesting.testcase import MAASTestCase
 from provisioningserver.drivers import make_setting_field
+from provisioningserver.drivers.power import JSON_POWER_DRIVERS_SCHEMA
+from provisioningserver.drivers.power.registry import PowerDriverRegistry
 
 
 class TestGetPowerTypeParametersFromJSON(MAASServerTestCase):
@@ -55,7 +56,7 @@ class TestGetPowerTypeParametersFromJSON(MAASServerTestCase):
         power_type_parameters = get_driver_parameters_from_json(
             json_parameters
         )
-        self.assertEqual(["", "something"], list(power_type_parameters))
+        self.assertCountEqual(["", "something"], power_type_parameters)
 
     def test_creates_dict_char_fields(self):
         json_parameters = [
@@ -76,7 +77,7 @@ class TestGetPowerTypeParametersFromJSON(MAASServerTestCase):
         power_type_parameters = get_driver_parameters_from_json(
             json_parameters
         )
-        for name, field in power_type_parameters.items():
+        for field in power_type_parameters.values():
             self.assertIsInstance(field, DictCharField)
 
     def test_overrides_defaults(self):
@@ -279,7 +280,7 @@ class TestMakeSettingField(MAASServerTestCase):
             "scope": "bmc",
             "secret": False,
         }
-        self.assertEqual(expected_field, json_field)
+        self.assertDictEqual(expected_field, json_field)
 
     def test_sets_field_values(self):
         expected_field = {
@@ -293,7 +294,7 @@ class TestMakeSettingField(MAASServerTestCase):
             "secret": False,
         }
         json_field = make_setting_field(**expected_field)
-        self.assertEqual(expected_field, json_field)
+        self.assertDictEqual(expected_field, json_field)
 
     def test_validates_choices(self):
         self.assertRaises(
@@ -318,7 +319,7 @@ class TestMakeSettingField(MAASServerTestCase):
             "scope": "bmc",
             "secret": True,
         }
-        self.assertEqual(expected_field, json_field)
+        self.assertDictEqual(expected_field, json_field)
 
 
 class TestAddPowerTypeParameters(MAASServerTestCase):
@@ -548,3 +549,14 @@ class TestPowerTypes(MAASTestCase):
         ]
         expected = {"namevalue": "descvalue", "namevalue2": "descvalue2"}
         self.assertEqual(expected, get_driver_types())
+
+    def test_get_all_power_types_copies_driver_fields(self):
+        power_type = next(
+            power_type
+            for power_type in driver_parameters.get_all_power_types()
+            if power_type["fields"]
+        )
+        driver = PowerDriverRegistry.get_item(power_type["name"])
+        for field, setting in zip(power_type["fields"], driver.settings):
+            self.assertEqual(setting, field)
+            self.assertIsNot(setting, field)
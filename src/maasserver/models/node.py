@@ -1476,9 +1476,10 @@ class Node(CleanSave, TimestampedModel):
         """Return the name of the VM instance for this machine, or None."""
 
         # LXD uses "instance_name", virsh uses "power_id"
-        return self.get_instance_power_parameters().get(
-            "instance_name"
-        ) or self.get_instance_power_parameters().get("power_id")
+        power_parameters = self.get_instance_power_parameters()
+        return power_parameters.get("instance_name") or power_parameters.get(
+            "power_id"
+        )
 
     @property
     def fqdn(self):
@@ -103,6 +103,13 @@ class RegionWorkerServiceMaker:
         else:
             reactor.callFromThread(disable_all_database_connections)
 
+    def _configureKeyPool(self):
+        # Keep a spare RSA key around for generating certificates, generated
+        # in a separate process so the worker isn't slowed down.
+        from provisioningserver.certificates import configure_key_pool
+
+        configure_key_pool(1, processes=1)
+
     def _configureCrochet(self):
         # Prevent other libraries from starting the reactor via crochet.
         # In other words, this makes crochet.setup() a no-op.
@@ -143,6 +150,7 @@ class RegionWorkerServiceMaker:
         self._configurePservSettings()
         self._configureReactor()
         self._configureCrochet()
+        self._configureKeyPool()
 
         # Reconfigure the logging if required.
         self._reconfigureLogging()
@@ -255,6 +263,7 @@ class RegionAllInOneServiceMaker(RegionMasterServiceMaker):
         self._configurePservSettings()
         self._configureReactor()
         self._configureCrochet()
+        self._configureKeyPool()
         self._ensureConnection()
 
         # Reconfigure the logging if required.
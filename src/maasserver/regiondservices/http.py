@@ -106,13 +106,13 @@ class RegionHTTPService(Service):
         key_path = certs_dir / "regiond-proxy-key.pem"
 
         atomic_write(
-            cert.fullchain_pem().encode(),
+            cert.fullchain_pem_bytes(),
             cert_path,
             overwrite=True,
             mode=0o644,
         )
         atomic_write(
-            cert.private_key_pem().encode(),
+            cert.private_key_pem_bytes(),
             key_path,
             overwrite=True,
             mode=0o600,
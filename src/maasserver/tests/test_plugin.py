@@ -29,7 +29,7 @@ from maasserver.utils.orm import (
 from maastesting.fixtures import TempDirectory
 from maastesting.matchers import MockCalledOnceWith
 from maastesting.testcase import MAASTestCase
-from provisioningserver import logger
+from provisioningserver import certificates, logger
 from provisioningserver.utils.twisted import asynchronous, ThreadPool
 
 
@@ -66,6 +66,10 @@ class TestServiceMaker(MAASTestCase):
         self.patch_autospec(RegionWorkerServiceMaker, "_set_pdeathsig")
         self.patch_autospec(crochet, "no_setup")
         self.patch_autospec(logger, "configure")
+        # Restore the certificate key pool configured by makeService(), and
+        # don't generate keys for it.
+        self.patch(certificates, "_KEY_POOL", certificates._KEY_POOL)
+        self.patch_autospec(certificates.RSAKeyPool, "warm_up")
         # Enable database access in the reactor just for these tests.
         asynchronous(enable_all_database_connections, timeout=5)()
         import_websocket_handlers()
@@ -174,6 +178,21 @@ class TestRegionWorkerServiceMaker(TestServiceMaker):
         )
         self.assertThat(crochet.no_setup, MockCalledOnceWith())
 
+    @asynchronous(timeout=5)
+    def test_configures_key_pool(self):
+        service_maker = RegionWorkerServiceMaker("Harry", "Hill")
+        # Disable _configureThreads() as it's too invasive right now.
+        self.patch_autospec(service_maker, "_configureThreads")
+        service_maker.makeService(Options())
+        self.assertEqual(certificates._KEY_POOL.size, 1)
+        self.assertEqual(certificates._KEY_POOL.processes, 1)
+        self.assertThat(
+            certificates.RSAKeyPool.warm_up,
+            MockCalledOnceWith(
+                certificates._KEY_POOL, certificates.DEFAULT_KEY_BITS
+            ),
+        )
+
     @asynchronous(timeout=5)
     def test_configures_thread_pool(self):
         # Patch and restore where it's visible because patching a running
@@ -404,6 +423,23 @@ class TestRegionAllInOneServiceMaker(TestServiceMaker):
         )
         self.assertThat(crochet.no_setup, MockCalledOnceWith())
 
+    @asynchronous(timeout=5)
+    def test_configures_key_pool(self):
+        service_maker = RegionAllInOneServiceMaker("Harry", "Hill")
+        # Disable _ensureConnection() its not allowed in the reactor.
+        self.patch_autospec(service_maker, "_ensureConnection")
+        # Disable _configureThreads() as it's too invasive right now.
+        self.patch_autospec(service_maker, "_configureThreads")
+        service_maker.makeService(Options())
+        self.assertEqual(certificates._KEY_POOL.size, 1)
+        self.assertEqual(certificates._KEY_POOL.processes, 1)
+        self.assertThat(
+            certificates.RSAKeyPool.warm_up,
+            MockCalledOnceWith(
+                certificates._KEY_POOL, certificates.DEFAULT_KEY_BITS
+            ),
+        )
+
     @asynchronous(timeout=5)
     def test_configures_thread_pool(self):
         # Patch and restore where it's visible because patching a running
@@ -15,6 +15,7 @@ import os.path
 import random
 import string
 import subprocess
+import tarfile
 import time
 from typing import Optional
 import unicodedata
@@ -748,6 +749,36 @@ class Factory:
 
         return tarball
 
+    def make_tarball_bytes(self, contents, compression="gz"):
+        """Create a tarball in memory containing the given files.
+
+        :param contents: A dict mapping file names to file contents.  Where
+            the value is `None`, the file will contain arbitrary data.
+        :param compression: The compression to use, as accepted by
+            `tarfile.open`, e.g. "gz" or "xz".  The fastest compression
+            level is used.
+        :return: The tarball, as `bytes`.
+        """
+        if compression == "xz":
+            options = {"preset": 0}
+        elif compression in ("gz", "bz2"):
+            options = {"compresslevel": 1}
+        else:
+            options = {}
+        buf = io.BytesIO()
+        with tarfile.open(
+            fileobj=buf, mode=f"w:{compression}", **options
+        ) as tar:
+            for name, content in contents.items():
+                if content is None:
+                    content = self.make_string().encode("ascii")
+                elif isinstance(content, str):
+                    content = content.encode("utf-8")
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+        return buf.getvalue()
+
     def make_response(self, status_code, content, content_type=None):
         """Return a similar response to that which `urllib` returns."""
         headers = http.client.HTTPMessage()
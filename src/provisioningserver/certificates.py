@@ -3,15 +3,24 @@
 
 """X509 certificates."""
 
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from functools import lru_cache, wraps
+import multiprocessing
 import os
 from pathlib import Path
-import random
+import queue
 import re
 import secrets
 from tempfile import mkstemp
-from typing import NamedTuple, Optional, Tuple
+import threading
+from typing import Dict, Optional, Tuple
 
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
 from OpenSSL import crypto
 
 from provisioningserver.path import get_tentative_data_path
@@ -26,16 +35,217 @@ CERTS_RE = re.compile(
 )
 
 
+# The size of the keys generated by `Certificate.generate` by default.
+DEFAULT_KEY_BITS = 4096
+
+
 class CertificateError(Exception):
     """Error handling certificates and keys."""
 
 
-class Certificate(NamedTuple):
+def generate_rsa_key(key_bits: int) -> crypto.PKey:
+    """Generate a new RSA private key of the given size."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=key_bits)
+    return crypto.PKey.from_cryptography_key(key)
+
+
+def _generate_rsa_key_pem(key_bits: int) -> bytes:
+    """Generate a new RSA private key, returning it PEM-encoded.
+
+    This runs in a worker process, so the key is returned in a form that
+    can be pickled.
+    """
+    return crypto.dump_privatekey(
+        crypto.FILETYPE_PEM, generate_rsa_key(key_bits)
+    )
+
+
+class RSAKeyPool:
+    """A pool of pre-generated RSA private keys.
+
+    Generating a 4096-bit RSA key takes seconds of CPU time. When a key is
+    requested, the pool is refilled in a background thread up to `size`
+    spare keys, so that the next request for a key of the same size doesn't
+    have to wait for it to be generated. `warm_up` fills the pool ahead of
+    the first request. A `size` of 0 disables pooling, and keys are always
+    generated on the spot.
+
+    If `processes` is set, the pool is refilled in that many worker
+    processes, so that key generation doesn't hold the GIL of the calling
+    process. The workers are started the first time the pool needs
+    refilling, and kept around until `shutdown` is called. A key requested
+    while the pool is empty is always generated in the calling process, so
+    that it doesn't have to wait for a refill to complete.
+
+    Keys are only kept in memory, and each key is handed out once.
+    """
+
+    def __init__(self, size: int = 1, processes: int = 0):
+        if size < 0:
+            raise ValueError(f"Invalid key pool size: {size}")
+        self.size = size
+        self.processes = processes
+        self._keys: Dict[int, queue.Queue] = {}
+        self._fillers: Dict[int, threading.Thread] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._shut_down = False
+        self._lock = threading.Lock()
+
+    def get_key(self, key_bits: int) -> crypto.PKey:
+        """Return an RSA private key of the given size.
+
+        The key is taken from the pool if one is available, otherwise it's
+        generated on the spot.
+        """
+        if self.size == 0:
+            return generate_rsa_key(key_bits)
+        with self._lock:
+            keys = self._keys.setdefault(key_bits, queue.Queue(self.size))
+        try:
+            key = keys.get_nowait()
+        except queue.Empty:
+            key = generate_rsa_key(key_bits)
+        self._refill(key_bits)
+        return key
+
+    def warm_up(self, key_bits: int):
+        """Start filling the pool with keys of the given size.
+
+        This returns immediately, the keys are generated in the background.
+        """
+        if self.size == 0:
+            return
+        with self._lock:
+            self._keys.setdefault(key_bits, queue.Queue(self.size))
+        self._refill(key_bits)
+
+    def available(self, key_bits: int) -> int:
+        """Return the number of spare keys of the given size."""
+        keys = self._keys.get(key_bits)
+        return 0 if keys is None else keys.qsize()
+
+    def wait(self):
+        """Wait for the background refills to complete."""
+        with self._lock:
+            fillers = list(self._fillers.values())
+        for filler in fillers:
+            filler.join()
+
+    def shutdown(self):
+        """Stop refilling the pool and shut down the worker processes."""
+        with self._lock:
+            self._shut_down = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _generate_in_worker(self, key_bits: int) -> crypto.PKey:
+        with self._lock:
+            if self._shut_down:
+                raise RuntimeError("Key pool has been shut down")
+            if self._executor is None and self.processes > 0:
+                # Don't fork, as the calling process is likely to be
+                # running other threads (like the reactor).
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            executor = self._executor
+        if executor is None:
+            return generate_rsa_key(key_bits)
+        pem = executor.submit(_generate_rsa_key_pem, key_bits).result()
+        return crypto.load_privatekey(crypto.FILETYPE_PEM, pem)
+
+    def _refill(self, key_bits: int):
+        with self._lock:
+            if key_bits in self._fillers:
+                return
+            thread = threading.Thread(
+                target=self._fill,
+                args=(key_bits,),
+                name=f"RSAKeyPool({key_bits})",
+                daemon=True,
+            )
+            self._fillers[key_bits] = thread
+        thread.start()
+
+    def _fill(self, key_bits: int):
+        keys = self._keys[key_bits]
+        while True:
+            with self._lock:
+                if keys.full():
+                    del self._fillers[key_bits]
+                    return
+            try:
+                key = self._generate_in_worker(key_bits)
+            except (CancelledError, RuntimeError, OSError):
+                # The executor can't take new work, either because the pool
+                # was shut down or because the interpreter is shutting down,
+                # so stop filling the pool.
+                with self._lock:
+                    del self._fillers[key_bits]
+                return
+            keys.put(key)
+
+
+# Pooling is disabled unless enabled by the daemon startup code, see
+# configure_key_pool().
+_KEY_POOL = RSAKeyPool(size=0)
+
+
+def configure_key_pool(
+    size: int, processes: int = 0, key_bits: int = DEFAULT_KEY_BITS
+):
+    """Configure the RSA key pool used by `Certificate.generate`.
+
+    Unless pooling is disabled, the pool starts filling with keys of
+    `key_bits` straight away, so the first certificate doesn't have to wait
+    for its key to be generated.
+
+    :param size: How many spare keys to keep for each key size. A size of 0
+        disables pooling.
+    :param processes: How many worker processes to generate keys in. If 0,
+        keys are generated in a thread of the calling process. The workers
+        are spawned, so they import the `__main__` module of the calling
+        process, which must therefore be safe to import.
+
+    The previously configured pool is shut down.
+    """
+    global _KEY_POOL
+    _KEY_POOL.shutdown()
+    _KEY_POOL = RSAKeyPool(size=size, processes=processes)
+    _KEY_POOL.warm_up(key_bits)
+
+
+def _cached(method):
+    """Cache the result of a `Certificate` method on the instance.
+
+    Certificates are immutable, so values derived from the key and the
+    certificate only need to be computed once.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self):
+        try:
+            return self._cache[name]
+        except KeyError:
+            value = self._cache[name] = method(self)
+            return value
+
+    return wrapper
+
+
+@dataclass(frozen=True, slots=True)
+class Certificate:
     """A self-signed X509 certificate with an associated key."""
 
     key: crypto.PKey
     cert: crypto.X509
     ca_certs: Tuple[crypto.X509]
+    _cache: dict = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     @classmethod
     def from_pem(cls, *materials: str, ca_certs_material: str = ""):
@@ -70,7 +280,7 @@ class Certificate(NamedTuple):
         cn: str,
         organization_name: Optional[str] = None,
         organizational_unit_name: Optional[str] = None,
-        key_bits: int = 4096,
+        key_bits: int = DEFAULT_KEY_BITS,
         validity: timedelta = timedelta(days=3650),
     ):
         """Low-level method for generating an X509 certificate.
@@ -82,23 +292,37 @@ class Certificate(NamedTuple):
         maasserver.utils.certificate.generate_certificate() for generating a
         certificate, so that the parameters get set properly.
         """
-        key = crypto.PKey()
-        key.generate_key(crypto.TYPE_RSA, key_bits)
+        key = _KEY_POOL.get_key(key_bits)
+        crypto_key = key.to_cryptography_key()
 
-        cert = crypto.X509()
-        cert.get_subject().CN = cn[:64]
+        issuer = []
         if organization_name:
-            cert.get_issuer().organizationName = organization_name[:64]
+            issuer.append(
+                x509.NameAttribute(
+                    NameOID.ORGANIZATION_NAME, organization_name[:64]
+                )
+            )
         if organizational_unit_name:
-            cert.get_issuer().organizationalUnitName = (
-                organizational_unit_name[:64]
+            issuer.append(
+                x509.NameAttribute(
+                    NameOID.ORGANIZATIONAL_UNIT_NAME,
+                    organizational_unit_name[:64],
+                )
             )
-        cert.set_serial_number(random.randint(0, (1 << 128) - 1))
-        cert.gmtime_adj_notBefore(0)
-        cert.gmtime_adj_notAfter(int(validity.total_seconds()))
-        cert.set_pubkey(key)
-        cert.sign(key, "sha512")
-        return cls(key, cert, ())
+        now = datetime.utcnow()
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(
+                x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, cn[:64])])
+            )
+            .issuer_name(x509.Name(issuer))
+            .public_key(crypto_key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now)
+            .not_valid_after(now + validity)
+            .sign(crypto_key, hashes.SHA256())
+        )
+        return cls(key, crypto.X509.from_cryptography(cert), ())
 
     def cn(self) -> str:
         """Return the certificate CN."""
@@ -115,45 +339,77 @@ class Certificate(NamedTuple):
     def _parse_datetime(self, date) -> Optional[datetime]:
         if date is None:
             return None
-        return datetime.strptime(date.decode("ascii"), "%Y%m%d%H%M%SZ")
+        # pyOpenSSL always returns dates as b"YYYYMMDDhhmmssZ", so parse
+        # the fields directly rather than going through strptime().
+        return datetime(
+            int(date[0:4]),
+            int(date[4:6]),
+            int(date[6:8]),
+            int(date[8:10]),
+            int(date[10:12]),
+            int(date[12:14]),
+        )
 
+    @_cached
     def expiration(self) -> Optional[datetime]:
         """Return the certificate expiration."""
         return self._parse_datetime(self.cert.get_notAfter())
 
+    @_cached
     def not_before(self) -> Optional[datetime]:
         """Return the certificate `not before` date."""
         return self._parse_datetime(self.cert.get_notBefore())
 
+    @_cached
+    def public_key_pem_bytes(self) -> bytes:
+        """Return PEM-encoded public key as bytes."""
+        return crypto.dump_publickey(crypto.FILETYPE_PEM, self.key)
+
+    @_cached
     def public_key_pem(self) -> str:
         """Return PEM-encoded public key."""
-        return crypto.dump_publickey(crypto.FILETYPE_PEM, self.key).decode(
-            "ascii"
-        )
+        return self.public_key_pem_bytes().decode("ascii")
+
+    @_cached
+    def private_key_pem_bytes(self) -> bytes:
+        """Return PEM-encoded private key as bytes."""
+        return crypto.dump_privatekey(crypto.FILETYPE_PEM, self.key)
 
+    @_cached
     def private_key_pem(self) -> str:
         """Return PEM-encoded private key."""
-        return crypto.dump_privatekey(crypto.FILETYPE_PEM, self.key).decode(
-            "ascii"
-        )
+        return self.private_key_pem_bytes().decode("ascii")
+
+    @_cached
+    def certificate_pem_bytes(self) -> bytes:
+        """Return PEM-encoded certificate as bytes."""
+        return crypto.dump_certificate(crypto.FILETYPE_PEM, self.cert)
 
+    @_cached
     def certificate_pem(self) -> str:
         """Return PEM-encoded certificate."""
-        return crypto.dump_certificate(crypto.FILETYPE_PEM, self.cert).decode(
-            "ascii"
-        )
+        return self.certificate_pem_bytes().decode("ascii")
 
-    def ca_certificates_pem(self) -> str:
-        """Return PEM-encoded CA certificates chain"""
+    def ca_certificates_pem_bytes(self) -> bytes:
+        """Return PEM-encoded CA certificates chain as bytes."""
         return b"".join(
             crypto.dump_certificate(crypto.FILETYPE_PEM, ca_cert)
             for ca_cert in self.ca_certs
-        ).decode("ascii")
+        )
+
+    def ca_certificates_pem(self) -> str:
+        """Return PEM-encoded CA certificates chain"""
+        return self.ca_certificates_pem_bytes().decode("ascii")
+
+    def fullchain_pem_bytes(self) -> bytes:
+        """Return PEM-encoded full chain as bytes."""
+        return self.certificate_pem_bytes() + self.ca_certificates_pem_bytes()
 
     def fullchain_pem(self) -> str:
         """Return PEM-encoded full chain (certificate + CA certificates)."""
-        return self.certificate_pem() + self.ca_certificates_pem()
+        return self.fullchain_pem_bytes().decode("ascii")
 
+    @_cached
     def cert_hash(self) -> str:
         """Return the SHA-256 digest for the certificate."""
         return self.cert.digest("sha256").decode("ascii")
@@ -161,15 +417,15 @@ class Certificate(NamedTuple):
     def tempfiles(self) -> Tuple[str, str]:
         """Return a 2-tuple with paths for tempfiles containing cert and key."""
 
-        def write_temp(content: str) -> str:
+        def write_temp(content: bytes) -> str:
             fileno, path = mkstemp()
-            os.write(fileno, bytes(content, "ascii"))
+            os.write(fileno, content)
             os.close(fileno)
             return path
 
         return (
-            write_temp(self.certificate_pem()),
-            write_temp(self.private_key_pem()),
+            write_temp(self.certificate_pem_bytes()),
+            write_temp(self.private_key_pem_bytes()),
         )
 
     @staticmethod
@@ -189,17 +445,25 @@ class Certificate(NamedTuple):
         )
 
 
-def get_maas_cert_tuple():
-    """Return a 2-tuple with certificate and private key paths.
+@lru_cache(maxsize=1)
+def _get_maas_cert_paths() -> Tuple[str, str]:
+    """Return the paths for the MAAS certificate and private key.
 
-    The format is the same used by python-requests."""
+    The paths don't change while MAAS is running, so they're computed once.
+    """
     if running_in_snap():
         cert_dir = SnapPaths.from_environ().common / "certificates"
     else:
         cert_dir = Path(get_tentative_data_path("/etc/maas/certificates"))
+    return str(cert_dir / "maas.crt"), str(cert_dir / "maas.key")
+
+
+def get_maas_cert_tuple():
+    """Return a 2-tuple with certificate and private key paths.
 
-    private_key = cert_dir / "maas.key"
-    certificate = cert_dir / "maas.crt"
-    if not private_key.exists() or not certificate.exists():
+    The format is the same used by python-requests."""
+    paths = _get_maas_cert_paths()
+    certificate, private_key = paths
+    if not os.path.exists(private_key) or not os.path.exists(certificate):
         return None
-    return str(certificate), str(private_key)
+    return paths
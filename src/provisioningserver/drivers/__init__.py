@@ -4,7 +4,8 @@
 """Drivers."""
 
 
-from jsonschema import validate
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 
 from provisioningserver.utils.registry import Registry
 
@@ -102,6 +103,43 @@ MULTIPLE_CHOICE_SETTING_PARAMETER_FIELD_SCHEMA = {
 }
 
 
+class SchemaValidator:
+    """A JSON schema validator, built once and reused."""
+
+    def __init__(self, validator):
+        self.validator = validator
+
+    def validate(self, instance):
+        """Validate `instance` against the schema.
+
+        Like `jsonschema.validate`, this raises the most relevant error
+        rather than the first one found.
+
+        :raise jsonschema.ValidationError: If `instance` is invalid.
+        """
+        error = best_match(self.validator.iter_errors(instance))
+        if error is not None:
+            raise error
+
+
+def make_schema_validator(schema) -> SchemaValidator:
+    """Return a reusable validator for the given JSON schema.
+
+    `jsonschema.validate` checks the schema and builds a new validator on
+    every call. For schemas that get validated repeatedly, build the
+    validator once with this function and call its `validate` method, which
+    raises the same errors `jsonschema.validate` would.
+
+    :raise jsonschema.SchemaError: If `schema` itself is not valid.
+    """
+    validator_class = validator_for(schema)
+    validator_class.check_schema(schema)
+    return SchemaValidator(validator_class(schema))
+
+
+CHOICE_FIELD_VALIDATOR = make_schema_validator(CHOICE_FIELD_SCHEMA)
+
+
 def make_ip_extractor(field_name, pattern=IP_EXTRACTOR_PATTERNS.IDENTITY):
     return {"field_name": field_name, "pattern": pattern}
 
@@ -155,7 +193,7 @@ def make_setting_field(
         field_type = "string"
     if choices is None:
         choices = []
-    validate(choices, CHOICE_FIELD_SCHEMA)
+    CHOICE_FIELD_VALIDATOR.validate(choices)
     if default is None:
         default = [] if field_type == "multiple_choice" else ""
     if scope not in (SETTING_SCOPE.BMC, SETTING_SCOPE.NODE):
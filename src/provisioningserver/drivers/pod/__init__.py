@@ -9,6 +9,7 @@ import attr
 
 from provisioningserver.drivers import (
     IP_EXTRACTOR_SCHEMA,
+    make_schema_validator,
     SETTING_PARAMETER_FIELD_SCHEMA,
 )
 from provisioningserver.drivers.power import PowerDriver, PowerDriverBase
@@ -36,6 +37,8 @@ JSON_POD_DRIVERS_SCHEMA = {
     "items": JSON_POD_DRIVER_SCHEMA,
 }
 
+JSON_POD_DRIVERS_VALIDATOR = make_schema_validator(JSON_POD_DRIVERS_SCHEMA)
+
 
 class PodError(Exception):
     """Base error for all pod driver failure commands."""
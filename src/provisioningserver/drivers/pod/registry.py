@@ -4,9 +4,7 @@
 """Load all pod drivers."""
 
 
-from jsonschema import validate
-
-from provisioningserver.drivers.pod import JSON_POD_DRIVERS_SCHEMA
+from provisioningserver.drivers.pod import JSON_POD_DRIVERS_VALIDATOR
 from provisioningserver.drivers.pod.lxd import LXDPodDriver
 from provisioningserver.drivers.pod.virsh import VirshPodDriver
 from provisioningserver.utils.registry import Registry
@@ -22,7 +20,7 @@ class PodDriverRegistry(Registry):
             driver.get_schema(detect_missing_packages=detect_missing_packages)
             for _, driver in cls
         ]
-        validate(schemas, JSON_POD_DRIVERS_SCHEMA)
+        JSON_POD_DRIVERS_VALIDATOR.validate(schemas)
         return schemas
 
 
@@ -18,6 +18,7 @@ from twisted.internet.defer import inlineCallbacks
 
 from maastesting.factory import factory
 from maastesting.testcase import MAASTestCase, MAASTwistedRunTest
+from provisioningserver.certificates import _get_maas_cert_paths
 from provisioningserver.drivers.pod import (
     Capabilities,
     DiscoveredMachineBlockDevice,
@@ -288,6 +289,8 @@ class FakeLXDCluster:
 def _make_maas_certs(test_case):
     tempdir = Path(test_case.useFixture(TempDir()).path)
     test_case.useFixture(EnvironmentVariable("MAAS_ROOT", str(tempdir)))
+    _get_maas_cert_paths.cache_clear()
+    test_case.addCleanup(_get_maas_cert_paths.cache_clear)
     test_case.certs_dir = tempdir / "etc/maas/certificates"
     test_case.certs_dir.mkdir(parents=True)
     maas_cert = test_case.certs_dir / "maas.crt"
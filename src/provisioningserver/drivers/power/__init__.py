@@ -6,13 +6,13 @@
 from abc import ABCMeta, abstractmethod, abstractproperty
 import sys
 
-from jsonschema import validate
 from twisted.internet import reactor
 from twisted.internet.defer import inlineCallbacks, returnValue
 from twisted.internet.threads import deferToThread
 
 from provisioningserver.drivers import (
     IP_EXTRACTOR_SCHEMA,
+    make_schema_validator,
     MULTIPLE_CHOICE_SETTING_PARAMETER_FIELD_SCHEMA,
     SETTING_PARAMETER_FIELD_SCHEMA,
 )
@@ -61,6 +61,9 @@ JSON_POWER_DRIVERS_SCHEMA = {
     "items": JSON_POWER_DRIVER_SCHEMA,
 }
 
+JSON_POWER_DRIVER_VALIDATOR = make_schema_validator(JSON_POWER_DRIVER_SCHEMA)
+JSON_POWER_DRIVERS_VALIDATOR = make_schema_validator(JSON_POWER_DRIVERS_SCHEMA)
+
 
 def is_power_parameter_set(param):
     return not (param is None or param == "" or param.isspace())
@@ -119,9 +122,8 @@ class PowerDriverBase(metaclass=ABCMeta):
 
     def __init__(self):
         super().__init__()
-        validate(
-            self.get_schema(detect_missing_packages=False),
-            JSON_POWER_DRIVER_SCHEMA,
+        JSON_POWER_DRIVER_VALIDATOR.validate(
+            self.get_schema(detect_missing_packages=False)
         )
 
     @abstractproperty
@@ -4,10 +4,8 @@
 """Load all power drivers."""
 
 
-from jsonschema import validate
-
 from provisioningserver.drivers.pod.registry import PodDriverRegistry
-from provisioningserver.drivers.power import JSON_POWER_DRIVERS_SCHEMA
+from provisioningserver.drivers.power import JSON_POWER_DRIVERS_VALIDATOR
 from provisioningserver.drivers.power.amt import AMTPowerDriver
 from provisioningserver.drivers.power.apc import APCPowerDriver
 from provisioningserver.drivers.power.dli import DLIPowerDriver
@@ -46,7 +44,7 @@ class PowerDriverRegistry(Registry):
             driver.get_schema(detect_missing_packages=detect_missing_packages)
             for _, driver in cls
         ]
-        validate(schemas, JSON_POWER_DRIVERS_SCHEMA)
+        JSON_POWER_DRIVERS_VALIDATOR.validate(schemas)
         return schemas
 
 
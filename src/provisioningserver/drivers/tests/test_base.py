@@ -9,7 +9,7 @@ import random
 import re
 from unittest.mock import sentinel
 
-from jsonschema import validate, ValidationError
+from jsonschema import SchemaError, validate, ValidationError
 from testtools.matchers import (
     AfterPreprocessing,
     ContainsAll,
@@ -26,6 +26,7 @@ from provisioningserver.drivers import (
     Architecture,
     ArchitectureRegistry,
     IP_EXTRACTOR_PATTERNS,
+    make_schema_validator,
     make_setting_field,
     SETTING_PARAMETER_FIELD_SCHEMA,
     SETTING_SCOPE,
@@ -304,6 +305,38 @@ class TestIpExtractor(MAASTestCase):
         self.assertThat(actual, self.get_expected_matcher())
 
 
+class TestMakeSchemaValidator(MAASTestCase):
+    def test_validates_instance(self):
+        validator = make_schema_validator(SETTING_PARAMETER_FIELD_SCHEMA)
+        setting = make_setting_field(
+            factory.make_name("name"), factory.make_name("label")
+        )
+        # doesn't raise ValidationError
+        validator.validate(setting)
+
+    def test_raises_validation_error_for_invalid_instance(self):
+        validator = make_schema_validator(SETTING_PARAMETER_FIELD_SCHEMA)
+        self.assertRaises(ValidationError, validator.validate, {})
+
+    def test_rejects_invalid_schema(self):
+        self.assertRaises(
+            SchemaError, make_schema_validator, {"type": "invalid"}
+        )
+
+    def test_raises_best_matching_error(self):
+        schema = {
+            "anyOf": [
+                {"type": "object", "required": ["a"]},
+                {"type": "array"},
+            ]
+        }
+        validator = make_schema_validator(schema)
+        error = self.assertRaises(ValidationError, validator.validate, {})
+        expected = self.assertRaises(ValidationError, validate, {}, schema)
+        self.assertEqual(error.message, expected.message)
+        self.assertEqual(error.message, "'a' is a required property")
+
+
 class TestMakeSettingField(MAASTestCase):
     def test_returns_valid_schema(self):
         setting = make_setting_field(
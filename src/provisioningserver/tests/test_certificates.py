@@ -3,16 +3,21 @@
 
 from datetime import datetime, timedelta
 from pathlib import Path
+import threading
 
 from fixtures import EnvironmentVariable, TempDir
 from OpenSSL import crypto
 
 from maastesting.factory import factory
 from maastesting.testcase import MAASTestCase
+from provisioningserver import certificates
 from provisioningserver.certificates import (
+    _get_maas_cert_paths,
     Certificate,
     CertificateError,
+    configure_key_pool,
     get_maas_cert_tuple,
+    RSAKeyPool,
 )
 from provisioningserver.testing.certificates import get_sample_cert
 
@@ -49,6 +54,42 @@ class TestCertificate(MAASTestCase):
             self.sample_cert.fullchain_pem(),
         )
 
+    def test_pem_bytes(self):
+        for method in (
+            "certificate_pem",
+            "private_key_pem",
+            "public_key_pem",
+            "ca_certificates_pem",
+            "fullchain_pem",
+        ):
+            pem_bytes = getattr(self.sample_cert, f"{method}_bytes")()
+            self.assertIsInstance(pem_bytes, bytes)
+            self.assertEqual(
+                pem_bytes, getattr(self.sample_cert, method)().encode("ascii")
+            )
+
+    def test_derived_values_are_cached(self):
+        cert = Certificate.from_pem(
+            self.sample_cert.certificate_pem(),
+            self.sample_cert.private_key_pem(),
+        )
+        for method in (
+            "cert_hash",
+            "certificate_pem",
+            "private_key_pem",
+            "public_key_pem",
+            "expiration",
+            "not_before",
+        ):
+            value = getattr(cert, method)()
+            self.assertEqual(value, getattr(self.sample_cert, method)())
+            self.assertIs(value, getattr(cert, method)())
+
+    def test_expiration_parses_not_after(self):
+        cert = Certificate.generate("maas", key_bits=1024)
+        cert.cert.set_notAfter(b"20301231235958Z")
+        self.assertEqual(cert.expiration(), datetime(2030, 12, 31, 23, 59, 58))
+
     def test_from_pem_single_material(self):
         cert = Certificate.from_pem(
             self.sample_cert.certificate_pem()
@@ -161,6 +202,9 @@ class TestCertificate(MAASTestCase):
         )
         self.assertEqual(cert.key.bits(), 4096)
         self.assertEqual(cert.key.type(), crypto.TYPE_RSA)
+        self.assertEqual(
+            cert.cert.get_signature_algorithm(), b"sha256WithRSAEncryption"
+        )
         self.assertGreaterEqual(
             datetime.utcnow() + timedelta(days=3650),
             cert.expiration(),
@@ -170,6 +214,14 @@ class TestCertificate(MAASTestCase):
         cert = Certificate.generate("maas", key_bits=1024)
         self.assertEqual(cert.key.bits(), 1024)
 
+    def test_generate_certificate_serial_number(self):
+        cert1 = Certificate.generate("maas", key_bits=1024)
+        cert2 = Certificate.generate("maas", key_bits=1024)
+        self.assertGreater(cert1.cert.get_serial_number(), 0)
+        self.assertNotEqual(
+            cert1.cert.get_serial_number(), cert2.cert.get_serial_number()
+        )
+
     def test_generate_certificate_validity(self):
         cert = Certificate.generate("maas", validity=timedelta(days=100))
         self.assertGreaterEqual(
@@ -212,9 +264,179 @@ class TestCertificate(MAASTestCase):
         )
 
 
+class TestRSAKeyPool(MAASTestCase):
+    def test_rejects_negative_size(self):
+        self.assertRaises(ValueError, RSAKeyPool, size=-1)
+
+    def test_get_key_generates_key_when_empty(self):
+        pool = RSAKeyPool(size=1)
+        key = pool.get_key(1024)
+        self.assertEqual(key.type(), crypto.TYPE_RSA)
+        self.assertEqual(key.bits(), 1024)
+        pool.wait()
+
+    def test_get_key_refills_pool(self):
+        pool = RSAKeyPool(size=2)
+        pool.get_key(1024)
+        pool.wait()
+        self.assertEqual(pool.available(1024), 2)
+
+    def test_get_key_uses_pooled_key(self):
+        keys = [object(), object(), object()]
+        self.patch(certificates, "generate_rsa_key").side_effect = keys
+        pool = RSAKeyPool(size=1)
+        self.assertIs(pool.get_key(1024), keys[0])
+        pool.wait()
+        self.assertIs(pool.get_key(1024), keys[1])
+        pool.wait()
+        self.assertEqual(pool.available(1024), 1)
+
+    def test_get_key_pools_by_size(self):
+        pool = RSAKeyPool(size=1)
+        pool.get_key(1024)
+        pool.get_key(2048)
+        pool.wait()
+        self.assertEqual(pool.available(1024), 1)
+        self.assertEqual(pool.available(2048), 1)
+        self.assertEqual(pool.get_key(2048).bits(), 2048)
+        pool.wait()
+
+    def test_warm_up_fills_pool(self):
+        pool = RSAKeyPool(size=2)
+        pool.warm_up(1024)
+        pool.wait()
+        self.assertEqual(pool.available(1024), 2)
+        self.assertEqual(pool.get_key(1024).bits(), 1024)
+        pool.wait()
+
+    def test_warm_up_size_zero(self):
+        pool = RSAKeyPool(size=0)
+        pool.warm_up(1024)
+        pool.wait()
+        self.assertEqual(pool.available(1024), 0)
+
+    def test_size_zero_disables_pooling(self):
+        pool = RSAKeyPool(size=0)
+        key = pool.get_key(1024)
+        self.assertEqual(key.bits(), 1024)
+        pool.wait()
+        self.assertEqual(pool.available(1024), 0)
+
+    def test_get_key_refills_in_processes(self):
+        pool = RSAKeyPool(size=1, processes=1)
+        self.addCleanup(pool.shutdown)
+        key = pool.get_key(1024)
+        pool.wait()
+        self.assertEqual(key.type(), crypto.TYPE_RSA)
+        self.assertEqual(key.bits(), 1024)
+        self.assertEqual(pool.available(1024), 1)
+        self.assertEqual(pool.get_key(1024).bits(), 1024)
+
+    def test_refill_reuses_workers(self):
+        pool = RSAKeyPool(size=1, processes=1)
+        self.addCleanup(pool.shutdown)
+        pool.get_key(1024)
+        pool.wait()
+        executor = pool._executor
+        self.assertIsNotNone(executor)
+        pool.get_key(1024)
+        pool.wait()
+        self.assertIs(pool._executor, executor)
+
+    def test_get_key_doesnt_wait_for_refill(self):
+        refilling = threading.Event()
+        release = threading.Event()
+        refilled = threading.Event()
+
+        def generate_in_worker(key_bits):
+            refilling.set()
+            release.wait(10)
+            refilled.set()
+            return object()
+
+        pool = RSAKeyPool(size=1, processes=1)
+        self.patch(pool, "_generate_in_worker", generate_in_worker)
+        pool.get_key(1024)
+        self.assertTrue(refilling.wait(10))
+        key = pool.get_key(1024)
+        self.assertFalse(refilled.is_set())
+        self.assertEqual(key.bits(), 1024)
+        release.set()
+        pool.wait()
+
+    def test_shutdown_stops_workers(self):
+        pool = RSAKeyPool(size=1, processes=1)
+        pool.get_key(1024)
+        pool.wait()
+        pool.shutdown()
+        self.assertIsNone(pool._executor)
+        pool.get_key(1024)
+        pool.wait()
+        self.assertIsNone(pool._executor)
+        self.assertEqual(pool.available(1024), 0)
+
+    def test_refill_stops_when_executor_shut_down(self):
+        pool = RSAKeyPool(size=1, processes=1)
+        self.patch(pool, "_generate_in_worker").side_effect = RuntimeError(
+            "cannot schedule new futures after shutdown"
+        )
+        pool.get_key(1024)
+        pool.wait()
+        self.assertEqual(pool.available(1024), 0)
+
+
+class TestConfigureKeyPool(MAASTestCase):
+    def setUp(self):
+        super().setUp()
+        self.patch(certificates, "_KEY_POOL", certificates._KEY_POOL)
+        self.addCleanup(lambda: certificates._KEY_POOL.shutdown())
+
+    def test_pooling_disabled_by_default(self):
+        self.assertEqual(certificates._KEY_POOL.size, 0)
+
+    def test_configure_key_pool(self):
+        self.patch(RSAKeyPool, "warm_up")
+        configure_key_pool(3, processes=2)
+        self.assertEqual(certificates._KEY_POOL.size, 3)
+        self.assertEqual(certificates._KEY_POOL.processes, 2)
+
+    def test_configure_key_pool_warms_up_default_key_size(self):
+        key = object()
+        self.patch(certificates, "generate_rsa_key").return_value = key
+        configure_key_pool(1)
+        certificates._KEY_POOL.wait()
+        self.assertEqual(
+            certificates._KEY_POOL.available(certificates.DEFAULT_KEY_BITS), 1
+        )
+        self.assertIs(
+            certificates._KEY_POOL.get_key(certificates.DEFAULT_KEY_BITS), key
+        )
+        certificates._KEY_POOL.wait()
+
+    def test_configure_key_pool_warms_up_key_size(self):
+        configure_key_pool(1, key_bits=1024)
+        certificates._KEY_POOL.wait()
+        self.assertEqual(certificates._KEY_POOL.available(1024), 1)
+
+    def test_configure_key_pool_size_zero_doesnt_warm_up(self):
+        generate_rsa_key = self.patch(certificates, "generate_rsa_key")
+        configure_key_pool(0)
+        certificates._KEY_POOL.wait()
+        generate_rsa_key.assert_not_called()
+
+    def test_configure_key_pool_shuts_down_previous_pool(self):
+        previous = certificates._KEY_POOL
+        shutdown = self.patch(previous, "shutdown")
+        configure_key_pool(0)
+        self.assertIsNot(certificates._KEY_POOL, previous)
+        shutdown.assert_called_once_with()
+
+
 class TestGetMAASCertTuple(MAASTestCase):
     def setUp(self):
         super().setUp()
+        _get_maas_cert_paths.cache_clear()
+        self.addCleanup(_get_maas_cert_paths.cache_clear)
         self.tempdir = Path(self.useFixture(TempDir()).path)
 
     def test_get_maas_cert_tuple_missing_files(self):
@@ -1,5 +1,6 @@
+from functools import cache
 import hashlib
-from hashlib import sha256
+import os
 from pathlib import Path
 
 from django.db import connection
@@ -12,20 +13,54 @@ from maasserver.models.bootresourcefile import BootResourceFile
 from maasserver.models.bootresourceset import BootResourceSet
 from maasserver.models.largefile import LargeFile
 from maasserver.utils.orm import reload_object
+from maastesting.factory import factory as maastesting_factory
+
+_ARCHIVE_TAR_XZ = BOOT_RESOURCE_FILE_TYPE.ARCHIVE_TAR_XZ
+_SYNCED = BOOT_RESOURCE_TYPE.SYNCED
+
+_CONTENT_UBUNTU = b"ubuntu-jammy"
+_HASH_UBUNTU = hashlib.sha256(_CONTENT_UBUNTU).hexdigest()
+_CONTENT_CENTOS = b"centos-8"
+_HASH_CENTOS = hashlib.sha256(_CONTENT_CENTOS).hexdigest()
+_CONTENT_SOME = b"some content"
+_HASH_SOME = hashlib.sha256(_CONTENT_SOME).hexdigest()
+_CONTENT_GRUB = b"grub content"
+_CONTENT_BOOT = b"boot content"
+
+
+@cache
+def _grub_tarball_bytes() -> bytes:
+    return maastesting_factory.make_tarball_bytes(
+        {"grubx64.efi": _CONTENT_GRUB, "bootx64.efi": _CONTENT_BOOT},
+        compression="xz",
+    )
+
+
+@pytest.fixture
+def target_dir(tmp_path):
+    yield tmp_path / "images-export"
 
 
 @pytest.fixture
-def target_dir(tmpdir):
-    yield Path(tmpdir / "images-export")
+def raw_cursor(maasdb):
+    with connection.cursor() as cursor:
+        yield cursor
 
 
-def list_files(base_path):
-    return {str(path.relative_to(base_path)) for path in base_path.iterdir()}
+def list_files(base_path: Path):
+    with os.scandir(base_path) as entries:
+        return {entry.name for entry in entries}
 
 
 @pytest.mark.usefixtures("maasdb")
 class TestExportImagesFromDB:
-    def make_LargeFile(self, factory, content: bytes = None, size=None):
+    def make_LargeFile(
+        self,
+        factory,
+        content: bytes = None,
+        size=None,
+        sha256: str | None = None,
+    ):
         if content is None:
             content_size = size
             if content_size is None:
@@ -33,17 +68,17 @@ class TestExportImagesFromDB:
             content = factory.make_bytes(size=content_size)
         if size is None:
             size = len(content)
-        sha256 = hashlib.sha256()
-        sha256.update(content)
-        digest = sha256.hexdigest()
-        largeobject = LargeObjectFile()
-        with largeobject.open("wb") as stream:
-            stream.write(content)
+        if sha256 is None:
+            sha256 = hashlib.sha256(content).hexdigest()
+        with connection.cursor() as cursor:
+            # Create and write the large object in a single query.
+            cursor.execute("SELECT lo_from_bytea(0, %s)", [content])
+            [oid] = cursor.fetchone()
         return LargeFile.objects.create(
-            sha256=digest,
+            sha256=sha256,
             size=len(content),
             total_size=size,
-            content=largeobject,
+            content=LargeObjectFile(oid),
         )
 
     def make_boot_resource_file_with_content_largefile(
@@ -55,8 +90,11 @@ class TestExportImagesFromDB:
         extra: str | None = None,
         content: bytes | None = None,
         size: int | None = None,
+        sha256: str | None = None,
     ) -> BootResourceFile:
-        largefile = self.make_LargeFile(factory, content=content, size=size)
+        largefile = self.make_LargeFile(
+            factory, content=content, size=size, sha256=sha256
+        )
         return factory.make_BootResourceFile(
             resource_set,
             filename=filename,
@@ -81,12 +119,12 @@ class TestExportImagesFromDB:
             version="20230901",
             label="stable",
         )
-        content1 = b"ubuntu-jammy"
         self.make_boot_resource_file_with_content_largefile(
             factory,
             resource_set=resource_set1,
             filename="boot-initrd",
-            content=content1,
+            content=_CONTENT_UBUNTU,
+            sha256=_HASH_UBUNTU,
         )
 
         resource2 = factory.make_BootResource(
@@ -98,18 +136,18 @@ class TestExportImagesFromDB:
             version="20230830",
             label="candidate",
         )
-        content2 = b"centos-8"
         self.make_boot_resource_file_with_content_largefile(
             factory,
             resource_set=resource_set2,
             filename="boot-kernel",
-            content=content2,
+            content=_CONTENT_CENTOS,
+            sha256=_HASH_CENTOS,
         )
         export_images_from_db(target_dir)
         assert list_files(target_dir) == {
             "bootloaders",
-            sha256(content1).hexdigest(),
-            sha256(content2).hexdigest(),
+            _HASH_UBUNTU,
+            _HASH_CENTOS,
         }
 
     def test_remove_extra_files(self, target_dir, factory):
@@ -123,8 +161,7 @@ class TestExportImagesFromDB:
     def test_export_overwrite_changed(self, target_dir, factory):
         target_dir.mkdir()
 
-        content = b"ubuntu-jammy"
-        image = target_dir / sha256(content).hexdigest()
+        image = target_dir / _HASH_UBUNTU
         image.write_bytes(b"old")
 
         resource = factory.make_BootResource(
@@ -140,12 +177,13 @@ class TestExportImagesFromDB:
             factory,
             resource_set=resource_set,
             filename="boot-initrd",
-            content=content,
+            content=_CONTENT_UBUNTU,
+            sha256=_HASH_UBUNTU,
         )
         export_images_from_db(target_dir)
-        assert image.read_bytes() == content
+        assert image.read_bytes() == _CONTENT_UBUNTU
 
-    def test_remove_largfile(self, target_dir, factory):
+    def test_remove_largfile(self, target_dir, factory, raw_cursor):
         resource = factory.make_BootResource(
             name="ubuntu/jammy",
             architecture="s390x/generic",
@@ -159,16 +197,16 @@ class TestExportImagesFromDB:
             factory,
             resource_set=resource_set,
             filename="boot-initrd",
-            content=b"some content",
+            content=_CONTENT_SOME,
+            sha256=_HASH_SOME,
         )
         largefile = resource_file.largefile
         export_images_from_db(target_dir)
 
         assert reload_object(largefile) is None
         # largeobject also gets deleted
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT loid FROM pg_largeobject")
-            assert cursor.fetchall() == []
+        raw_cursor.execute("SELECT EXISTS(SELECT 1 FROM pg_largeobject)")
+        assert raw_cursor.fetchone() == (False,)
 
     def test_no_largefile_ignore(self, target_dir, factory):
         resource = factory.make_BootResource(
@@ -195,9 +233,9 @@ class TestExportImagesFromDB:
         export_images_from_db(target_dir)
         assert resource_file.exists()
 
-    def test_booloaders_export(self, tmpdir, target_dir, factory):
+    def test_booloaders_export(self, target_dir, factory):
         resource = factory.make_BootResource(
-            rtype=BOOT_RESOURCE_TYPE.SYNCED,
+            rtype=_SYNCED,
             name="grub-efi/uefi",
             architecture="amd64/generic",
             bootloader_type="uefi",
@@ -207,21 +245,12 @@ class TestExportImagesFromDB:
             version="20230901",
             label="stable",
         )
-        tarball = Path(
-            factory.make_tarball(
-                tmpdir,
-                {
-                    "grubx64.efi": b"grub content",
-                    "bootx64.efi": b"boot content",
-                },
-            )
-        )
         self.make_boot_resource_file_with_content_largefile(
             factory,
             resource_set=resource_set,
-            filetype=BOOT_RESOURCE_FILE_TYPE.ARCHIVE_TAR_XZ,
+            filetype=_ARCHIVE_TAR_XZ,
             filename="grub2-signed.tar.xz",
-            content=tarball.read_bytes(),
+            content=_grub_tarball_bytes(),
         )
         export_images_from_db(target_dir)
         bootloader_dir = target_dir / "bootloaders/uefi/amd64"
@@ -5,10 +5,12 @@
 
 
 from datetime import datetime
+import io
 from itertools import count
 import os.path
 from random import randint
 import subprocess
+import tarfile
 from unittest.mock import sentinel
 
 from netaddr import IPAddress, IPNetwork
@@ -324,6 +326,26 @@ class TestFactory(MAASTestCase):
             contents = unpacked_file.read()
         self.assertGreater(len(contents), 0)
 
+    def test_make_tarball_bytes(self):
+        filename = factory.make_name()
+        contents = {filename: factory.make_string().encode("ascii")}
+
+        tarball = factory.make_tarball_bytes(contents, compression="xz")
+
+        with tarfile.open(fileobj=io.BytesIO(tarball), mode="r:xz") as tar:
+            self.assertEqual(tar.getnames(), [filename])
+            self.assertEqual(
+                tar.extractfile(filename).read(), contents[filename]
+            )
+
+    def test_make_tarball_bytes_makes_up_content_if_None(self):
+        filename = factory.make_name()
+
+        tarball = factory.make_tarball_bytes({filename: None})
+
+        with tarfile.open(fileobj=io.BytesIO(tarball), mode="r:gz") as tar:
+            self.assertGreater(tar.getmember(filename).size, 0)
+
     def test_make_parsed_url_accepts_explicit_port(self):
         port = factory.pick_port()
         url = factory.make_parsed_url(port=port)